@@ -20,10 +20,14 @@ Safety:
 - Ensure stable network connection
 """
 
+import os
 import sys
+import ctypes
+import ctypes.util
 import time
 import math
 import threading
+from collections import deque
 import termios
 import tty
 import select
@@ -50,72 +54,122 @@ except ImportError as e:
     print("   pip3 install -e .")
     sys.exit(1)
 
+# Shared CRC helper for command validation
+_CRC = CRC()
+_crc_calc = _CRC.Crc
+
+_PI_2 = math.pi * 0.5
+_ZERO_VEL = (0.0, 0.0, 0.0)
+_NO_KEYS = frozenset()
+
+# Key codes checked every control tick
+_KEY_SPACE = ord(' ')
+_KEY_P = ord('p')
+_KEY_S = ord('s')
+_KEY_G = ord('g')
+_KEY_R = ord('r')
+
+# CSI arrow-key final bytes -> PyBullet-compatible key codes
+_ARROWS = {'A': 65362, 'B': 65364, 'C': 65363, 'D': 65361}  # UP, DOWN, RIGHT, LEFT
+
+def _yaw_correction(yaw_error: float) -> float:
+    """P-controller on yaw error (gain 0.5), clamped to +/-0.5 rad/s"""
+    return 0.5 if yaw_error > 1.0 else -0.5 if yaw_error < -1.0 else yaw_error * 0.5
+
+def _path_mode_targets(path_mode: str) -> Tuple[float, int]:
+    """Target yaw and linear velocity axis for a path mode
+    
+    forward: walk along the robot's X axis facing yaw 0.
+    leftward: crab-walk along Y while holding a perpendicular (90 degree) yaw.
+    """
+    return (0.0, 0) if path_mode == 'forward' else (_PI_2, 1)
+
 class KeyboardInput:
     """Non-blocking keyboard input handler for real-time control"""
     
     def __init__(self):
         self.keys_pressed = set()
-        self.key_events = {}
+        self.key_events = deque()  # Appended by listener, drained by get_keys
         self.running = True
         self.old_settings = None
+        self._fd = None
+        self._poller = None
         
     def start(self):
         """Start keyboard monitoring in separate thread"""
-        self.old_settings = termios.tcgetattr(sys.stdin)
-        tty.setraw(sys.stdin.fileno()) 
+        self._fd = sys.stdin.fileno()
+        self.old_settings = termios.tcgetattr(self._fd)
+        tty.setraw(self._fd)
+        self._poller = select.poll()
+        self._poller.register(self._fd, select.POLLIN)
         self.thread = threading.Thread(target=self._keyboard_listener, daemon=True)
         self.thread.start()
         
     def stop(self):
         """Stop keyboard monitoring and restore terminal"""
         self.running = False
+        if self._poller:
+            self._poller.unregister(self._fd)
+            self._poller = None
         if self.old_settings:
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_settings)
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self.old_settings)
             
     def _keyboard_listener(self):
         """Listen for keyboard events"""
+        poller = self._poller
+        fd = self._fd
         while self.running:
-            if select.select([sys.stdin], [], [], 0.1)[0]:
+            if poller.poll(100):
                 try:
-                    key = sys.stdin.read(1)
+                    # Raw fd reads: sys.stdin's text buffer would swallow the
+                    # rest of an escape sequence out from under os.read
+                    key = os.read(fd, 1).decode('latin-1')
                     if key:
                         # Convert to ASCII code for consistency with PyBullet
                         key_code = ord(key.lower()) if len(key) == 1 else 0
                         
                         # Special key mappings
                         if key == '\x1b':  # ESC sequence start
-                            # Read arrow keys
-                            if select.select([sys.stdin], [], [], 0.1)[0]:
-                                key2 = sys.stdin.read(1)
-                                if key2 == '[' and select.select([sys.stdin], [], [], 0.1)[0]:
-                                    key3 = sys.stdin.read(1)
-                                    if key3 == 'A': key_code = 65362  # UP
-                                    elif key3 == 'B': key_code = 65364  # DOWN
-                                    elif key3 == 'C': key_code = 65363  # RIGHT
-                                    elif key3 == 'D': key_code = 65361  # LEFT
+                            # Arrow keys arrive back-to-back as ESC [ A..D,
+                            # a bare ESC has nothing pending behind it
+                            rest = os.read(fd, 2) if poller.poll(0) else b''
+                            if len(rest) == 2 and rest[0] == 0x5B:  # '['
+                                key_code = _ARROWS.get(chr(rest[1]), key_code)
                         elif key == ' ':
                             key_code = ord(' ')
                         elif key == '\x03':  # Ctrl+C
                             self.running = False
                             raise KeyboardInterrupt()
                             
-                        # Record key event
-                        self.key_events[key_code] = 3  # KEY_WAS_TRIGGERED equivalent
+                        # Record key event (KEY_WAS_TRIGGERED equivalent)
+                        self.key_events.append(key_code)
                         
                 except KeyboardInterrupt:
                     raise
                 except:
                     continue
                     
+    def has_events(self) -> bool:
+        """Cheap check for pending key events"""
+        return bool(self.key_events)
+        
     def get_keys(self):
-        """Get current key events (mimics PyBullet interface)"""
-        keys = self.key_events.copy()
-        self.key_events.clear()
+        """Get the set of key codes triggered since the last call"""
+        keys = set()
+        events = self.key_events
+        while events:
+            keys.add(events.popleft())
         return keys
 
 class Go2RealRobot:
     """Real Go2 robot interface that matches the simulation robot interface"""
     
+    CMD_QUEUE_SIZE = 4  # Pending velocity setpoints; older ones are dropped when full
+    STATE_RING_SIZE = 4  # Position slots written by the DDS thread (power of two)
+    HEARTBEAT_INTERVAL = 0.45  # Re-send unchanged commands at least this often (s)
+    STATE_TIMEOUT = 0.5  # Consider the robot lost after this long without state (s)
+    ERROR_REPORT_INTERVAL = 1.0  # Print repeated publish errors at most this often (s)
+    
     def __init__(self, network_interface: str = "enp2s0"):
         self.network_interface = network_interface
         self.start_pos = [0.0, 0.0, 0.28]  # Default starting position
@@ -130,22 +184,36 @@ class Go2RealRobot:
             self.cmd_publisher = ChannelPublisher("rt/sportmodecommand", SportModeCmd_)
             self.cmd_publisher.Init()
             
-            # Subscribers for robot state  
-            self.state_subscriber = ChannelSubscriber("rt/sportmodestate", unitree_go_msg_dds__SportModeState_)
-            self.state_subscriber.Init()
+            # Immutable (seq, (vx, vy, vyaw)) setpoints for the publishing thread,
+            # which alone owns the command object it fills, CRCs and writes
+            self._cmd_queue = deque(maxlen=self.CMD_QUEUE_SIZE)
+            self._cmd_ready = threading.Event()
+            self._cmd_seq = 0  # Last sequence number queued
+            self._cmd_done_seq = 0  # Last sequence number the publisher finished writing
+            self._start_command_publishing()
+            
+            # Pre-built zero-velocity command for emergency stops (CRC already set)
+            self._stop_cmd = self._make_cmd()
+            self._stop_cmd.crc = _crc_calc(self._stop_cmd)
             
             # Robot state
-            self.current_position = [0.0, 0.0, 0.28]
-            self.is_connected = False
-            self.last_cmd_time = time.time()
+            # Single-writer ring: the handler fills the slot after _state_head,
+            # then publishes it by moving the head, so readers never see a
+            # half-written position
+            self._state_ring = [[0.0, 0.0, 0.28] for _ in range(self.STATE_RING_SIZE)]
+            self._state_head = 0
+            self._last_state_time = None
+            self.last_cmd_time = 0.0
+            self._last_vel = None  # Last (vx, vy, vyaw) handed to the publisher
             
-            # Start state monitoring
-            self._start_state_monitoring()
+            # Subscribers for robot state (pushed to _on_state by DDS)
+            self.state_subscriber = ChannelSubscriber("rt/sportmodestate", unitree_go_msg_dds__SportModeState_)
+            self.state_subscriber.Init(self._on_state, 10)
             
             # Wait for connection
             timeout = 5.0
-            start_time = time.time()
-            while not self.is_connected and (time.time() - start_time) < timeout:
+            start_time = time.monotonic()
+            while not self.is_connected and (time.monotonic() - start_time) < timeout:
                 time.sleep(0.1)
                 
             if self.is_connected:
@@ -158,32 +226,99 @@ class Go2RealRobot:
             print(f"Failed to connect to Go2: {e}")
             raise
     
-    def _start_state_monitoring(self):
-        """Start monitoring robot state in background thread"""
-        def monitor_state():
+    @staticmethod
+    def _make_cmd():
+        """Build a speed-mode command with the constant fields filled in"""
+        cmd = SportModeCmd_()
+        cmd.mode = 2  # Speed mode
+        cmd.gait_type = 1  # Trot gait
+        cmd.speed_level = 0  # Normal speed
+        cmd.foot_raise_height = 0.08  # Foot lift height
+        cmd.body_height = 0.28  # Body height
+        cmd.position = [0.0, 0.0]  # Not used in speed mode
+        cmd.velocity = [0.0, 0.0, 0.0]
+        cmd.yaw_speed = 0.0
+        return cmd
+    
+    def _start_command_publishing(self):
+        """Start finalizing and publishing queued commands in background thread"""
+        def publish_commands():
+            # Keep CRC work off the core reserved for the control loop
+            try:
+                cpus = os.sched_getaffinity(0) - {_CONTROL_CPU}
+                if cpus:
+                    os.sched_setaffinity(0, cpus)
+            except (AttributeError, OSError):
+                pass
+            
+            # Rate-limit error output so a failing link doesn't stall this thread on stdout
+            suppressed = 0
+            last_report = -self.ERROR_REPORT_INTERVAL
+            
+            # Only ever touched by this thread, so it cannot change between CRC and Write
+            cmd = self._make_cmd()
+            
             while True:
-                try:
-                    msg = self.state_subscriber.Read()
-                    if msg:
-                        self.current_position = [
-                            msg.position[0], 
-                            msg.position[1], 
-                            msg.body_height
-                        ]
-                        self.current_yaw = msg.imu_state.rpy[2]  # Yaw angle
-                        self.is_connected = True
-                    time.sleep(0.02)  # 50Hz monitoring
-                except Exception as e:
-                    if self.is_connected:
-                        print(f"Lost connection to robot: {e}")
-                        self.is_connected = False
-                    continue
+                self._cmd_ready.wait()
+                self._cmd_ready.clear()
+                while self._cmd_queue:
+                    seq, vel = self._cmd_queue.popleft()
+                    try:
+                        cmd.velocity[0] = vel[0]
+                        cmd.velocity[1] = vel[1]
+                        cmd.velocity[2] = vel[2]
+                        cmd.yaw_speed = vel[2]
+                        # Calculate CRC for command validation
+                        cmd.crc = _crc_calc(cmd)
+                        self.cmd_publisher.Write(cmd)
+                    except Exception as e:
+                        now = time.monotonic()
+                        if now - last_report >= self.ERROR_REPORT_INTERVAL:
+                            more = f" ({suppressed} more suppressed)" if suppressed else ""
+                            print(f"Error sending velocity command: {e}{more}")
+                            suppressed = 0
+                            last_report = now
+                        else:
+                            suppressed += 1
+                    finally:
+                        self._cmd_done_seq = seq
                     
-        self.monitor_thread = threading.Thread(target=monitor_state, daemon=True)
-        self.monitor_thread.start()
+        self.publish_thread = threading.Thread(target=publish_commands, daemon=True)
+        self.publish_thread.start()
+    
+    def flush(self, timeout: float = 0.1):
+        """Wait until every command queued so far has been written to DDS"""
+        target = self._cmd_seq
+        deadline = time.monotonic() + timeout
+        while self._cmd_done_seq < target and time.monotonic() < deadline:
+            time.sleep(0.001)
+    
+    def _on_state(self, msg):
+        """Handle a robot state message delivered by the DDS subscriber"""
+        head = (self._state_head + 1) & (self.STATE_RING_SIZE - 1)
+        pos = self._state_ring[head]
+        pos[0] = msg.position[0]
+        pos[1] = msg.position[1]
+        pos[2] = msg.body_height
+        self._state_head = head
+        self.current_yaw = msg.imu_state.rpy[2]  # Yaw angle
+        self._last_state_time = time.monotonic()
     
-    def set_base_velocity(self, linear_velocity: List[float], angular_velocity: List[float]):
-        """Set robot base velocity (matches simulation interface)"""
+    @property
+    def is_connected(self) -> bool:
+        """True while state messages keep arriving within STATE_TIMEOUT"""
+        last = self._last_state_time
+        return last is not None and (time.monotonic() - last) < self.STATE_TIMEOUT
+    
+    def set_base_velocity(self, linear_velocity: List[float], angular_velocity: List[float], force: bool = False):
+        """Set robot base velocity (matches simulation interface)
+        
+        Unchanged commands are only re-published once per heartbeat interval,
+        and nothing is published while the robot is disconnected, unless
+        force is set.
+        """
+        if not force and not self.is_connected:
+            return
         try:
             # Safety check - limit velocities
             max_linear_speed = 3.5  # m/s
@@ -194,49 +329,50 @@ class Go2RealRobot:
             vy = max(-max_linear_speed, min(max_linear_speed, linear_velocity[1]))
             vyaw = max(-max_angular_speed, min(max_angular_speed, angular_velocity[2]))
             
-            cmd = SportModeCmd_()
-            cmd.mode = 2  # Speed mode
-            cmd.gait_type = 1  # Trot gait
-            cmd.speed_level = 0  # Normal speed
-            cmd.foot_raise_height = 0.08  # Foot lift height
-            cmd.body_height = 0.28  # Body height
-            cmd.position = [0.0, 0.0]  # Not used in speed mode
-            
-            # Set velocities
-            cmd.velocity = [float(vx), float(vy), float(vyaw)]
-            cmd.yaw_speed = float(vyaw)
+            # Skip redundant publishes between heartbeats
+            vel = (float(vx), float(vy), float(vyaw))
+            now = time.monotonic()
+            if not force and vel == self._last_vel and (now - self.last_cmd_time) < self.HEARTBEAT_INTERVAL:
+                return
             
-            # Calculate CRC for command validation
-            crc = CRC()
-            cmd.crc = crc.Crc(cmd)
-            
-            self.cmd_publisher.Write(cmd)
-            self.last_cmd_time = time.time()
+            # Hand the setpoint off; the publisher builds and writes the command
+            self._cmd_seq += 1
+            self._cmd_queue.append((self._cmd_seq, vel))
+            self._cmd_ready.set()
+            self._last_vel = vel
+            self.last_cmd_time = now
             
         except Exception as e:
             print(f"Error sending velocity command: {e}")
     
-    def get_position(self) -> List[float]:
-        """Get current robot position (matches simulation interface)"""
-        return self.current_position.copy()
+    def get_position(self) -> Tuple[float, float, float]:
+        """Get current robot position snapshot (matches simulation interface)"""
+        return tuple(self._state_ring[self._state_head])
     
     def reset(self):
         """Reset robot to starting position and stop movement"""
         print("Resetting robot...")
         # Stop all movement
-        self.set_base_velocity([0, 0, 0], [0, 0, 0])
+        self.set_base_velocity(_ZERO_VEL, _ZERO_VEL)
         
         # Reset position tracking (robot doesn't physically teleport)
-        self.start_pos = self.current_position.copy()
+        self.start_pos = self.get_position()
         self.initial_yaw = self.current_yaw
         print(f"New starting position: {self.start_pos}")
     
     def emergency_stop(self):
         """Emergency stop - immediately halt all movement"""
         print("EMERGENCY STOP!")
+        # Drop anything still queued so it cannot be published after the stop
+        self._cmd_queue.clear()
+        self._last_vel = _ZERO_VEL
         for _ in range(10):  # Send multiple stop commands
-            self.set_base_velocity([0, 0, 0], [0, 0, 0])
+            try:
+                self.cmd_publisher.Write(self._stop_cmd)
+            except Exception as e:
+                print(f"Error sending stop command: {e}")
             time.sleep(0.01)
+        self.last_cmd_time = time.monotonic()
     
     def __del__(self):
         """Cleanup on deletion"""
@@ -245,6 +381,37 @@ class Go2RealRobot:
         except:
             pass
 
+# Core reserved for the main control loop when real-time setup succeeds
+_CONTROL_CPU = 2
+_MCL_CURRENT_FUTURE = 3  # MCL_CURRENT | MCL_FUTURE
+
+def configure_realtime(cpu: int = _CONTROL_CPU, priority: int = 80):
+    """Best-effort soft real-time setup for the calling (control) thread
+    
+    Locks the whole process into RAM, then pins the calling thread to a
+    single core and switches it to SCHED_FIFO. Threads created afterwards
+    inherit both, so call this only once the helper threads (DDS, command
+    publisher, keyboard listener) are already running. Each step is skipped
+    (with a note) when the platform or the user's privileges do not allow it.
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if libc.mlockall(_MCL_CURRENT_FUTURE) != 0:
+            print(f"Note: mlockall unavailable ({os.strerror(ctypes.get_errno())})")
+    except (OSError, AttributeError):
+        pass
+    
+    try:
+        if cpu in os.sched_getaffinity(0):
+            os.sched_setaffinity(0, {cpu})
+    except (AttributeError, OSError):
+        pass
+    
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+    except (AttributeError, OSError) as e:
+        print(f"Note: SCHED_FIFO unavailable ({e}), using default scheduler")
+
 def print_safety_warning():
     """Print important safety information"""
     print("\n" + "*" * 20)
@@ -291,12 +458,18 @@ def main():
         # Initialize keyboard monitoring
         keyboard.start()
         
+        # Reduce scheduling and paging jitter on the control thread; done after
+        # the DDS, publisher and keyboard threads exist so they don't inherit
+        # the reserved core and SCHED_FIFO priority
+        configure_realtime()
+        
         # Simulation state (matches original)
         path_mode = 'leftward'  # Start in leftward mode
+        target_yaw, lin_axis = _path_mode_targets(path_mode)
         is_walking = False
         start_time = None
         initial_pos = None
-        last_status_time = time.time()
+        last_status_time = time.monotonic()
         
         print("\n" + "="*50)
         print("Go2 Real Robot - 15m Linear Path")
@@ -315,26 +488,38 @@ def main():
         print(f"Network Interface: {network_interface}")
         print("="*50 + "\n")
         
-        # Main control loop
+        # Bind hot-loop lookups to locals
+        _time = time.monotonic
+        _sleep = time.sleep
+        _hypot = math.hypot
+        set_vel = robot.set_base_velocity
+        get_keys = keyboard.get_keys
+        has_keys = keyboard.has_events
+        
+        # Main control loop, scheduled against fixed deadlines so the rate
+        # does not sag by the time spent in each iteration
+        period = 0.02  # 50Hz control loop
+        linear_velocity = [0.0, 0.0, 0.0]  # Scratch buffers reused every tick
+        angular_velocity = [0.0, 0.0, 0.0]
+        next_tick = _time() + period
         while True:
-            current_time = time.time()
+            current_time = _time()
             
             # Connection watchdog
             if not robot.is_connected:
                 print("Robot disconnected! Attempting to reconnect...")
+                if is_walking:
+                    # Routine publishes are dropped while disconnected, so
+                    # push one stop through at the start of the outage
+                    set_vel(_ZERO_VEL, _ZERO_VEL, force=True)
                 is_walking = False
-                robot.set_base_velocity([0, 0, 0], [0, 0, 0])
                 time.sleep(1)
                 continue
             
-            # Send heartbeat command to maintain connection
-            if current_time - robot.last_cmd_time > 0.5:
-                robot.set_base_velocity([0, 0, 0], [0, 0, 0])
-            
             # Handle keyboard input (matches simulation logic)
-            keys = keyboard.get_keys()
+            keys = get_keys() if has_keys() else _NO_KEYS
             
-            if ord(' ') in keys:
+            if _KEY_SPACE in keys:
                 is_walking = not is_walking
                 if is_walking:
                     start_time = current_time
@@ -343,31 +528,33 @@ def main():
                     path_controller.stop_start_time = None  # Reset stop timer when starting
                     print(f"Walking: ON")
                 else:
-                    robot.set_base_velocity([0, 0, 0], [0, 0, 0])
+                    set_vel(_ZERO_VEL, _ZERO_VEL)
                     print(f"Walking: OFF")
                     
-            if ord('p') in keys:
+            if _KEY_P in keys:
                 path_mode = 'leftward' if path_mode == 'forward' else 'forward'
+                target_yaw, lin_axis = _path_mode_targets(path_mode)
                 print(f" Path Mode: {path_mode}")
                 print("   Note: Robot will gradually adjust orientation while moving")
                 
-            if ord('s') in keys:
+            if _KEY_S in keys:
                 path_controller.current_speed_mode = (path_controller.current_speed_mode + 1) % len(path_controller.speed_modes)
                 current_mode = path_controller.speed_modes[path_controller.current_speed_mode]
                 gaze_status = "with gaze" if path_controller.gaze_enabled else "no gaze"
                 print(f" Speed Mode: {current_mode} ({gaze_status})")
                 
-            if ord('g') in keys:
+            if _KEY_G in keys:
                 path_controller.gaze_enabled = not path_controller.gaze_enabled
                 current_mode = path_controller.speed_modes[path_controller.current_speed_mode]
                 gaze_status = "with gaze" if path_controller.gaze_enabled else "no gaze"
                 print(f" Gaze Mode: {'ON' if path_controller.gaze_enabled else 'OFF'}")
                 print(f"   Current: {current_mode} ({gaze_status})")
                 
-            if ord('r') in keys:
+            if _KEY_R in keys:
                 robot.reset()
                 is_walking = False
                 path_mode = 'leftward'
+                target_yaw, lin_axis = _path_mode_targets(path_mode)
                 path_controller.was_stopped = False
                 path_controller.stop_start_time = None  # Reset stop timer
                 print(" Robot Reset")
@@ -379,8 +566,8 @@ def main():
                 
                 # Calculate distance traveled
                 if initial_pos is not None:
-                    distance_traveled = math.sqrt((current_pos[0] - initial_pos[0])**2 + 
-                                                (current_pos[1] - initial_pos[1])**2)
+                    distance_traveled = _hypot(current_pos[0] - initial_pos[0],
+                                               current_pos[1] - initial_pos[1])
                 else:
                     distance_traveled = 0
                 
@@ -402,42 +589,38 @@ def main():
                     print(f" Distance: {distance_traveled:.1f}m, Speed: {target_speed:.1f}m/s")
                     last_status_time = current_time
                 
-                # Calculate velocities based on path mode
-                if path_mode == 'forward':
-                    # Move forward (robot's X direction when facing forward)
-                    linear_velocity = [target_speed, 0, 0]
-                    
-                    # Add rotation to face forward if needed
-                    yaw_error = -robot.current_yaw  # Target yaw is 0 for forward
-                    yaw_correction = max(-0.5, min(0.5, yaw_error * 0.5))  # P-controller
-                    
-                else:  # leftward
-                    # Crab-walk sideways (move in Y direction)
-                    linear_velocity = [0, target_speed, 0]
-                    
-                    # Maintain perpendicular orientation (90 degrees)
-                    target_yaw = math.pi / 2
-                    yaw_error = target_yaw - robot.current_yaw
-                    yaw_correction = max(-0.5, min(0.5, yaw_error * 0.5))  # P-controller
+                # Calculate velocities based on path mode targets
+                linear_velocity[lin_axis] = target_speed
+                linear_velocity[1 - lin_axis] = 0.0
+                yaw_rate = _yaw_correction(target_yaw - robot.current_yaw)
                 
                 # Apply gaze control through angular velocity
-                gaze_rad = math.radians(gaze_angle) if path_controller.gaze_enabled else 0
-                angular_velocity = [0, 0, yaw_correction + gaze_rad * 0.1]
+                if path_controller.gaze_enabled:
+                    yaw_rate += gaze_angle * 0.1
+                angular_velocity[2] = yaw_rate
                 
                 # Send commands to robot
-                robot.set_base_velocity(linear_velocity, angular_velocity)
+                set_vel(linear_velocity, angular_velocity)
                 
                 # Check if path completed
                 if distance_traveled >= path_controller.path_length:
                     print(f"Path completed! Distance: {distance_traveled:.2f}m")
-                    robot.set_base_velocity([0, 0, 0], [0, 0, 0])
+                    set_vel(_ZERO_VEL, _ZERO_VEL)
                     is_walking = False
                     
             else:
-                # Stop and maintain stationary
-                robot.set_base_velocity([0, 0, 0], [0, 0, 0])
+                # Stop and maintain stationary (also serves as the heartbeat,
+                # unchanged commands are coalesced by set_base_velocity)
+                set_vel(_ZERO_VEL, _ZERO_VEL)
 
-            time.sleep(0.02)  # 50Hz control loop
+            # Sleep until the next deadline, resyncing after an overrun
+            now = _time()
+            sleep_for = next_tick - now
+            if sleep_for > 0:
+                _sleep(sleep_for)
+            next_tick += period
+            if now > next_tick + period:
+                next_tick = now + period
             
     except KeyboardInterrupt:
         print("\nEmergency stop activated!")
@@ -452,7 +635,8 @@ def main():
     finally:
         # Cleanup
         if robot:
-            robot.set_base_velocity([0, 0, 0], [0, 0, 0])
+            robot.set_base_velocity(_ZERO_VEL, _ZERO_VEL, force=True)
+            robot.flush()
             print("Robot movement stopped")
         
         keyboard.stop()
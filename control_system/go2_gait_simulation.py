@@ -1,26 +1,96 @@
 import pybullet as p
 import pybullet_data
+import os
 import time
 import math
+import multiprocessing
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it the gait kernel runs as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+GAZE_AMPLITUDE = 0.2617993877991494  # 15 degrees in radians
+
+@njit(cache=True, fastmath=True)
+def _compute_trot_targets(t, omega, amp, step_h, hip0, thigh0, calf0, phase_sign, out):
+    """Fill out[12] with trot joint targets, laid out as Go2Robot.TROT_JOINT_ORDER.
+    
+    Legs are processed as 4-wide lanes (FR, RL, FL, RR); phase_sign flips the
+    second diagonal pair half a cycle out of phase (sin(x + pi) == -sin(x)).
+    """
+    s = math.sin(omega * t) * phase_sign
+    
+    # Lifting motion for step height
+    lift = np.maximum(s, 0.0) * step_h
+    
+    out[0:4] = hip0 + 0.1 * s
+    out[4:8] = thigh0 + s * amp - 0.5 * lift
+    out[8:12] = calf0 - s * amp * 0.8 + 1.2 * lift
+
+# Plain Python on purpose: PathController also runs in the real-robot loop, where
+# a lazy JIT compile on the first walking tick would stall the controller
+def _profile_speed(kind, a, b, distance, path_length, breakpoint):
+    """Speed of a (kind, a, b) profile at distance; kinds as in PathController."""
+    if kind == 0:  # LINEAR
+        return a + (b - a) * (distance / path_length)
+    return a if distance < breakpoint else b
+
 class Go2Robot:
     """A class to manage the Go2 robot, including joint control for walking."""
     
+    # Joint order used for batched motor commands in apply_trot_gait:
+    # structure-of-arrays (hips, thighs, calves), legs as diagonal pairs
+    # (a class-body comprehension cannot see TROT_LEGS, hence the inline leg tuple)
+    TROT_LEGS = ['FR', 'RL', 'FL', 'RR']
+    TROT_PHASE_SIGN = [1.0, 1.0, -1.0, -1.0]  # Pair 1 (FR, RL) vs pair 2 (FL, RR)
+    TROT_JOINT_ORDER = [f'{leg}_{part}_joint' for part in ('hip', 'thigh', 'calf') for leg in ('FR', 'RL', 'FL', 'RR')]
+    
+    # Fixed attribute set, read every tick; avoids a per-instance __dict__
+    __slots__ = (
+        'start_pos', 'robot_id', 'joint_indices', 'joint_names',
+        'gait_frequency', 'gait_amplitude', 'step_height', '_two_pi_f',
+        '_current_pose', '_lin', '_ang',
+        '_last_pose_tick', '_last_pos', '_last_orn',
+        '_trot_joint_ids', '_targets', '_phase_sign',
+        '_stand_joint_ids', '_stand_targets',
+    )
+    
+    # Leg joint tables already scanned in this process, keyed by (urdf_path, mtime)
+    _joint_tables = {}
+    
+    @classmethod
+    def _leg_joint_table(cls, urdf_path, robot_id):
+        """Return {joint_name: index} for the leg joints, scanning each URDF only once."""
+        try:
+            key = (urdf_path, os.path.getmtime(urdf_path))
+        except OSError:
+            key = None  # Resolved through Bullet's search path; do not cache
+        table = cls._joint_tables.get(key) if key else None
+        if table is None:
+            table = {}
+            for i in range(p.getNumJoints(robot_id)):
+                joint_info = p.getJointInfo(robot_id, i)
+                joint_name = joint_info[1].decode('utf-8')
+                if 'hip' in joint_name or 'thigh' in joint_name or 'calf' in joint_name:
+                    table[joint_name] = i
+            if key:
+                cls._joint_tables[key] = table
+        return table
+    
     def __init__(self, urdf_path, start_pos):
         self.start_pos = start_pos
         # Load the robot facing 90 degrees from path (perpendicular to Y-axis = along X-axis = 0 degrees)
-        self.robot_id = p.loadURDF(urdf_path, start_pos, p.getQuaternionFromEuler([0, 0, 0]))
+        self.robot_id = p.loadURDF(urdf_path, start_pos, QUAT_LEFTWARD)
         
         # Identify and store leg joint indices
-        self.joint_indices = {}
-        self.joint_names = []
-        for i in range(p.getNumJoints(self.robot_id)):
-            joint_info = p.getJointInfo(self.robot_id, i)
-            joint_name = joint_info[1].decode('utf-8')
-            if 'hip' in joint_name or 'thigh' in joint_name or 'calf' in joint_name:
-                self.joint_indices[joint_name] = i
-                self.joint_names.append(joint_name)
+        self.joint_indices = dict(self._leg_joint_table(urdf_path, self.robot_id))
+        self.joint_names = list(self.joint_indices)
 
         # Print joint information for debugging
         print("Available joints:")
@@ -31,85 +101,113 @@ class Go2Robot:
         self.gait_frequency = 1.5  # Hz
         self.gait_amplitude = 0.3  # Radians
         self.step_height = 0.15
-
-    def apply_trot_gait(self, t, speed_factor=1.0):
-        """Applies a procedural trot gait with speed-dependent frequency."""
-        
-        # Adjust gait frequency based on speed
-        adjusted_frequency = self.gait_frequency * speed_factor
+        self._two_pi_f = 2 * math.pi * self.gait_frequency  # Base angular gait frequency
         
-        # Diagonal pairs of legs move together in a trot
-        phase1 = math.sin(2 * math.pi * adjusted_frequency * t)
-        phase2 = math.sin(2 * math.pi * adjusted_frequency * t + math.pi)
-
-        # Define base angles for proper standing pose
-        hip_angle = 0.0
-        thigh_angle = 0.8
-        calf_angle = -1.4
+        # Last pose sent to Bullet; joint motor targets persist, so re-issuing
+        # the same pose is skipped
+        self._current_pose = None  # 'stand', 'trot' or None (unknown)
         
-        # Get lifting motion for step height
-        lift1 = max(0, math.sin(2 * math.pi * adjusted_frequency * t)) * self.step_height
-        lift2 = max(0, math.sin(2 * math.pi * adjusted_frequency * t + math.pi)) * self.step_height
-
-        # Apply hip joint control
-        hip_oscillation = phase1 * 0.1
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['FR_hip_joint'], p.POSITION_CONTROL, targetPosition=hip_angle + hip_oscillation)
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['RL_hip_joint'], p.POSITION_CONTROL, targetPosition=hip_angle + hip_oscillation)
+        # Reused velocity buffers for set_base_velocity_scalar
+        self._lin = [0.0, 0.0, 0.0]
+        self._ang = [0.0, 0.0, 0.0]
         
-        hip_oscillation2 = phase2 * 0.1
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['FL_hip_joint'], p.POSITION_CONTROL, targetPosition=hip_angle + hip_oscillation2)
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['RR_hip_joint'], p.POSITION_CONTROL, targetPosition=hip_angle + hip_oscillation2)
-
-        # Animate Pair 1 (FR, RL)
-        thigh1 = thigh_angle + phase1 * self.gait_amplitude - lift1 * 0.5
-        calf1 = calf_angle - phase1 * self.gait_amplitude * 0.8 + lift1 * 1.2
+        # Base pose cache, refreshed at most once per simulation tick
+        self._last_pose_tick = -1
+        self._last_pos = None
+        self._last_orn = None
         
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['FR_thigh_joint'], p.POSITION_CONTROL, targetPosition=thigh1)
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['FR_calf_joint'], p.POSITION_CONTROL, targetPosition=calf1)
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['RL_thigh_joint'], p.POSITION_CONTROL, targetPosition=thigh1)
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['RL_calf_joint'], p.POSITION_CONTROL, targetPosition=calf1)
-
-        # Animate Pair 2 (FL, RR)
-        thigh2 = thigh_angle + phase2 * self.gait_amplitude - lift2 * 0.5
-        calf2 = calf_angle - phase2 * self.gait_amplitude * 0.8 + lift2 * 1.2
+        # Precomputed joint index lists so each pose is a single motor call
+        self._trot_joint_ids = [self.joint_indices[name] for name in self.TROT_JOINT_ORDER]
+        self._targets = np.empty(len(self._trot_joint_ids))
+        self._phase_sign = np.array(self.TROT_PHASE_SIGN)
         
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['FL_thigh_joint'], p.POSITION_CONTROL, targetPosition=thigh2)
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['FL_calf_joint'], p.POSITION_CONTROL, targetPosition=calf2)
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['RR_thigh_joint'], p.POSITION_CONTROL, targetPosition=thigh2)
-        p.setJointMotorControl2(self.robot_id, self.joint_indices['RR_calf_joint'], p.POSITION_CONTROL, targetPosition=calf2)
-
-    def set_standing_pose(self):
-        """Set the robot to a natural standing position."""
+        # Standing pose targets
         hip_angle = 0.0
         thigh_angle = 0.8
         calf_angle = -1.4
-        
+        self._stand_joint_ids = []
+        self._stand_targets = []
         for joint_name, joint_idx in self.joint_indices.items():
             if 'hip' in joint_name:
-                p.setJointMotorControl2(self.robot_id, joint_idx, p.POSITION_CONTROL, targetPosition=hip_angle)
+                target = hip_angle
             elif 'thigh' in joint_name:
-                p.setJointMotorControl2(self.robot_id, joint_idx, p.POSITION_CONTROL, targetPosition=thigh_angle)
-            elif 'calf' in joint_name:
-                p.setJointMotorControl2(self.robot_id, joint_idx, p.POSITION_CONTROL, targetPosition=calf_angle)
+                target = thigh_angle
+            else:  # calf
+                target = calf_angle
+            self._stand_joint_ids.append(joint_idx)
+            self._stand_targets.append(target)
+
+    def apply_trot_gait(self, t, speed_factor=1.0):
+        """Applies a procedural trot gait with speed-dependent frequency."""
+        
+        # Base angles for proper standing pose
+        hip_angle = 0.0
+        thigh_angle = 0.8
+        calf_angle = -1.4
+        
+        _compute_trot_targets(t, self._two_pi_f * speed_factor, self.gait_amplitude, self.step_height,
+                              hip_angle, thigh_angle, calf_angle, self._phase_sign, self._targets)
+        p.setJointMotorControlArray(self.robot_id, self._trot_joint_ids, p.POSITION_CONTROL,
+                                    targetPositions=self._targets.tolist())
+        self._current_pose = 'trot'
+
+    def set_standing_pose(self):
+        """Set the robot to a natural standing position."""
+        # Bullet's PD controllers keep holding the last targets, so only
+        # re-issue them when coming out of another pose
+        if self._current_pose == 'stand':
+            return
+        p.setJointMotorControlArray(self.robot_id, self._stand_joint_ids, p.POSITION_CONTROL, targetPositions=self._stand_targets)
+        self._current_pose = 'stand'
 
     def set_base_velocity(self, linear_velocity, angular_velocity):
         """Sets the velocity of the robot's base."""
         p.resetBaseVelocity(self.robot_id, linearVelocity=linear_velocity, angularVelocity=angular_velocity)
         
-    def get_position(self):
+    def set_base_velocity_scalar(self, vy, wz):
+        """Set forward (Y) speed and yaw rate without building new velocity lists."""
+        self._lin[1] = vy
+        self._ang[2] = wz
+        p.resetBaseVelocity(self.robot_id, self._lin, self._ang)
+        
+    def get_state(self, tick=None):
+        """Get (position, orientation) of the base, read from Bullet once per tick.
+        
+        Passing the same tick again reuses the cached pose; tick=None always re-reads.
+        """
+        if tick is None or tick != self._last_pose_tick:
+            self._last_pos, self._last_orn = p.getBasePositionAndOrientation(self.robot_id)
+            self._last_pose_tick = -1 if tick is None else tick
+        return self._last_pos, self._last_orn
+        
+    def get_position(self, tick=None):
         """Get current position of the robot."""
-        pos, _ = p.getBasePositionAndOrientation(self.robot_id)
-        return pos
+        return self.get_state(tick)[0]
         
     def reset(self):
         # Reset to starting position facing 90 degrees from path (0 degrees orientation)
-        p.resetBasePositionAndOrientation(self.robot_id, self.start_pos, p.getQuaternionFromEuler([0, 0, 0]))
+        p.resetBasePositionAndOrientation(self.robot_id, self.start_pos, QUAT_LEFTWARD)
         p.resetBaseVelocity(self.robot_id, [0,0,0], [0,0,0])
+        self._last_pose_tick = -1  # Teleported, drop the cached pose
+        self._current_pose = None
         self.set_standing_pose()
 
 class PathController:
     """Controls speed and gaze along the 15m path."""
     
+    # Speed profile kinds used in speed_params
+    LINEAR = 0     # interpolate from a to b over the whole path
+    STEP = 1       # a until the breakpoint, then b
+    STOP_STEP = 2  # a until the breakpoint, stop for STOP_DURATION, then b
+    BREAKPOINT = 8.0     # m
+    STOP_DURATION = 2.0  # s
+    
+    __slots__ = (
+        'path_length', 'speed_modes', 'speed_params', 'current_speed_mode',
+        'gaze_enabled', 'was_stopped', 'stop_start_time',
+        '_gaze_t', '_gaze_s', '_gaze_s_prev', '_gaze_2cos',
+    )
+    
     def __init__(self):
         self.path_length = 15.0
         self.speed_modes = [
@@ -120,92 +218,199 @@ class PathController:
             "1_stop_1",        # 1m/s, stop at 8m, then 1m/s
             "3_stop_3"         # 3m/s, stop at 8m, then 3m/s
         ]
+        # Numeric (kind, a, b) profile for each entry of speed_modes
+        self.speed_params = [
+            (self.LINEAR, 1.0, 3.0),
+            (self.LINEAR, 3.0, 1.0),
+            (self.STEP, 1.0, 3.0),
+            (self.STEP, 3.0, 1.0),
+            (self.STOP_STEP, 1.0, 1.0),
+            (self.STOP_STEP, 3.0, 3.0),
+        ]
         self.current_speed_mode = 0
         self.gaze_enabled = False
         self.was_stopped = False  # Track if robot was previously stopped
         self.stop_start_time = None  # Track when stop period began
         
+        # Gaze sine state for the fixed-step recurrence in get_gaze_angle
+        self._gaze_t = None
+        self._gaze_s = 0.0
+        self._gaze_s_prev = None
+        self._gaze_2cos = 2.0 * math.cos(0.5 * SIM_DT)
+        
     def get_speed(self, distance_traveled, current_time=None):
         """Calculate current speed based on mode and distance."""
-        mode = self.speed_modes[self.current_speed_mode]
+        kind, a, b = self.speed_params[self.current_speed_mode]
         
-        if mode == "1-3_gradual":
-            # Linear interpolation from 1 to 3 m/s over 15m
-            return 1.0 + (distance_traveled / self.path_length) * 2.0
-            
-        elif mode == "3-1_gradual":
-            # Linear interpolation from 3 to 1 m/s over 15m
-            return 3.0 - (distance_traveled / self.path_length) * 2.0
-            
-        elif mode == "1-3_abrupt":
-            # 1 m/s until 8m, then 3 m/s
-            return 1.0 if distance_traveled < 8.0 else 3.0
-            
-        elif mode == "3-1_abrupt":
-            # 3 m/s until 8m, then 1 m/s
-            return 3.0 if distance_traveled < 8.0 else 1.0
+        if kind == self.STOP_STEP and distance_traveled >= self.BREAKPOINT:
+            # Start stop timer when we reach the breakpoint
+            if self.stop_start_time is None:
+                self.stop_start_time = current_time
             
-        elif mode == "1_stop_1":
-            # 1 m/s, stop at 8m for 2 seconds, then 1 m/s
-            if distance_traveled < 8.0:
-                return 1.0
-            elif distance_traveled >= 8.0:
-                # Start stop timer when we reach 8m
-                if self.stop_start_time is None:
-                    self.stop_start_time = current_time
-                
-                # Stop for 2 seconds, then resume
-                if current_time and (current_time - self.stop_start_time) < 2.0:
-                    return 0.0  # Stop for 2 seconds
-                else:
-                    return 1.0  # Resume
-            else:
-                return 1.0
-                
-        elif mode == "3_stop_3":
-            # 3 m/s, stop at 8m for 2 seconds, then 3 m/s
-            if distance_traveled < 8.0:
-                return 3.0
-            elif distance_traveled >= 8.0:
-                # Start stop timer when we reach 8m
-                if self.stop_start_time is None:
-                    self.stop_start_time = current_time
-                
-                # Stop for 2 seconds, then resume
-                if current_time and (current_time - self.stop_start_time) < 2.0:
-                    return 0.0  # Stop for 2 seconds
-                else:
-                    return 3.0  # Resume
-            else:
-                return 3.0
-                
-        return 1.0  # Default
+            # Stop for STOP_DURATION, then resume
+            if current_time and (current_time - self.stop_start_time) < self.STOP_DURATION:
+                return 0.0
+        
+        return _profile_speed(kind, a, b, distance_traveled, self.path_length, self.BREAKPOINT)
     
     def get_gaze_angle(self, t):
-        """Calculate gaze angle if gaze mode is enabled."""
+        """Calculate gaze angle (radians) if gaze mode is enabled.
+        
+        Calls exactly SIM_DT apart (as from walk_step) advance the sine with the
+        recurrence sin(x + d) = 2cos(d)sin(x) - sin(x - d); any other time step
+        (e.g. wall-clock callers) falls back to math.sin and restarts it.
+        """
         if not self.gaze_enabled:
             return 0.0
         # Subtle oscillating gaze movement
-        return 15.0 * math.sin(0.5 * t)  # ±15 degrees
+        s = self._gaze_s
+        if self._gaze_t is not None and abs(t - self._gaze_t - SIM_DT) < 1e-9:
+            if self._gaze_s_prev is not None:
+                new = self._gaze_2cos * s - self._gaze_s_prev
+            else:
+                new = math.sin(0.5 * t)
+            self._gaze_s_prev = s
+        else:
+            new = math.sin(0.5 * t)
+            self._gaze_s_prev = None
+        self._gaze_t = t
+        self._gaze_s = new
+        return GAZE_AMPLITUDE * new  # ±15 degrees
 
-def main():
-    # Setup
-    p.connect(p.GUI)
+URDF_PATH = "/URDF/go2_description.urdf"
+START_POS = [0, 0, 0.4]
+# Base orientations for the two path modes (Bullet computes these without a connection)
+QUAT_FORWARD = p.getQuaternionFromEuler([0, 0, math.pi/2])  # Facing the goal (+Y)
+QUAT_LEFTWARD = p.getQuaternionFromEuler([0, 0, 0])  # Perpendicular to the path
+PHYSICS_DT = 1. / 240.  # Physics resolution (Bullet's default fixed time step)
+SUBSTEPS = 4
+SIM_DT = PHYSICS_DT * SUBSTEPS  # Time advanced by one stepSimulation() call (60 Hz control)
+
+# Keyboard handling: human input is far slower than the 60 Hz loop
+KEY_SPACE, KEY_P, KEY_S, KEY_G, KEY_R = ord(' '), ord('p'), ord('s'), ord('g'), ord('r')
+KEY_POLL_TICKS = 2  # Poll keys every 2 steps (~30 Hz)
+_NO_KEYS = {}
+
+def setup(connection_mode=p.GUI):
+    """Connect to Bullet, build the scene and load the robot.
+    
+    Returns the Go2Robot, or None (after disconnecting) if the URDF fails to load.
+    """
+    p.connect(connection_mode)
+    # Bullet splits each stepSimulation() into SUBSTEPS physics steps, so physics
+    # keeps its 240 Hz resolution while the Python control loop runs at 60 Hz
+    p.setPhysicsEngineParameter(fixedTimeStep=SIM_DT, numSubSteps=SUBSTEPS)
     p.setAdditionalSearchPath(pybullet_data.getDataPath())
     p.setGravity(0, 0, -9.8)
     p.loadURDF("plane.urdf")
-
-    # Path setup - 15m straight path
-    start_pos = [0, 0, 0.4]
-    end_pos = [0, 15, 0.4]  # 15m forward path
     
     try:
-        robot = Go2Robot("/URDF/go2_description.urdf", start_pos)
+        return Go2Robot(URDF_PATH, START_POS)
     except p.error as e:
         print(f"Failed to load robot: {e}")
         p.disconnect()
+        return None
+
+def walk_step(robot, path_controller, initial_pos, t):
+    """Advance one walking step at time t (no printing or pacing).
+    
+    Returns the distance traveled before the step; the simulation is only
+    stepped while the path is still incomplete.
+    """
+    current_pos = robot.get_position()
+    distance_traveled = abs(current_pos[1] - initial_pos[1])  # Path runs along Y only
+    if distance_traveled >= path_controller.path_length:
+        return distance_traveled
+    
+    target_speed = path_controller.get_speed(distance_traveled, t)
+    gaze_angle = path_controller.get_gaze_angle(t)
+    robot.set_base_velocity_scalar(target_speed, gaze_angle * 0.1)
+    if target_speed > 0:
+        speed_factor = target_speed * 0.5
+        robot.apply_trot_gait(t, speed_factor if speed_factor > 0.1 else 0.1)
+    else:
+        robot.set_standing_pose()
+    
+    p.stepSimulation()
+    return distance_traveled
+
+def run_episode(config):
+    """Run one headless walk along the 15m path as fast as Bullet can step.
+    
+    config keys (all optional): speed_mode (index into PathController.speed_modes),
+    path_mode ('leftward' or 'forward'), gaze_enabled (bool), max_steps (int).
+    Time is simulation time, so results do not depend on wall-clock speed.
+    """
+    robot = setup(p.DIRECT)
+    if robot is None:
+        return None
+    
+    try:
+        path_controller = PathController()
+        path_controller.current_speed_mode = config.get('speed_mode', 0)
+        path_controller.gaze_enabled = config.get('gaze_enabled', False)
+        path_mode = config.get('path_mode', 'leftward')
+        max_steps = config.get('max_steps', int(60 / SIM_DT))  # 60 s of sim time
+        
+        robot.set_standing_pose()
+        if path_mode == 'forward':
+            p.resetBasePositionAndOrientation(robot.robot_id, START_POS, QUAT_FORWARD)
+        initial_pos = robot.get_position()
+        
+        distance_traveled = 0.0
+        step = 0
+        while step < max_steps:
+            distance_traveled = walk_step(robot, path_controller, initial_pos, (step + 1) * SIM_DT)
+            if distance_traveled >= path_controller.path_length:
+                break
+            step += 1
+        
+        return {
+            'config': config,
+            'steps': step,
+            'sim_time': step * SIM_DT,
+            'distance': distance_traveled,
+            'completed': distance_traveled >= path_controller.path_length,
+        }
+    finally:
+        p.disconnect()
+
+def _pin_worker(counter):
+    """Pool initializer: bind each worker process to its own CPU.
+    
+    counter is a shared multiprocessing.Value handing out worker indices.
+    """
+    with counter.get_lock():
+        worker_id = counter.value
+        counter.value += 1
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[worker_id % len(cpus)]})
+    except (AttributeError, OSError):
+        pass
+
+def batch_main(num_workers, configs):
+    """Run run_episode over configs in parallel DIRECT-mode worker processes.
+    
+    Example:
+        configs = [{'speed_mode': i} for i in range(6)]
+        results = batch_main(os.cpu_count(), configs)
+    """
+    counter = multiprocessing.Value('i', 0)
+    with multiprocessing.Pool(num_workers, initializer=_pin_worker, initargs=(counter,)) as pool:
+        return pool.map(run_episode, configs)
+
+def main(realtime=True):
+    """Interactive GUI simulation; realtime=False steps as fast as possible."""
+    # Setup
+    robot = setup(p.GUI)
+    if robot is None:
         return
 
+    # Path setup - 15m straight path
+    start_pos = START_POS
+    end_pos = [0, 15, 0.4]  # 15m forward path
+
     # Initialize path controller
     path_controller = PathController()
     robot.set_standing_pose()
@@ -219,12 +424,9 @@ def main():
     # Draw 15m path
     p.addUserDebugLine(start_pos, end_pos, [1, 0, 0], 3)
     
-    # Add distance markers every 2.5m
-    for i in range(1, 7):
-        marker_pos = [0, i * 2.5, 0.4]
-        p.addUserDebugLine([marker_pos[0], marker_pos[1], marker_pos[2] - 0.2], 
-                          [marker_pos[0], marker_pos[1], marker_pos[2] + 0.2], 
-                          [0, 1, 0], 2)
+    # Add distance markers every 2.5m, drawn as dotted vertical ticks in one call
+    marker_points = [[0, i * 2.5, 0.2 + 0.05 * k] for i in range(1, 7) for k in range(9)]
+    p.addUserDebugPoints(marker_points, [[0, 1, 0]] * len(marker_points), pointSize=5)
     
     print("\n" + "="*50)
     print("Go2 Path Simulation - 15m Linear Path")
@@ -241,50 +443,51 @@ def main():
     print(f"\nStarting Mode: {path_mode}")
     print("="*50 + "\n")
 
+    tick = 0
     try:
         while True:
-            current_time = time.time()
+            # Unpaced runs follow sim time (like run_episode) so the gait, gaze,
+            # speed profile and stop pause stay in step with the physics
+            current_time = time.time() if realtime else tick * SIM_DT
             
             # Handle input
-            keys = p.getKeyboardEvents()
-            if ord(' ') in keys and keys[ord(' ')] & p.KEY_WAS_TRIGGERED:
+            tick += 1
+            keys = p.getKeyboardEvents() if tick % KEY_POLL_TICKS == 0 else _NO_KEYS
+            if (v := keys.get(KEY_SPACE)) and v & p.KEY_WAS_TRIGGERED:
                 is_walking = not is_walking
                 if is_walking:
                     start_time = current_time
-                    initial_pos = robot.get_position()
+                    initial_pos = robot.get_position(tick)
                     path_controller.was_stopped = False  # Reset stop state when starting
                     path_controller.stop_start_time = None  # Reset stop timer when starting
                 print(f"Walking: {'ON' if is_walking else 'OFF'}")
                 
-            if ord('p') in keys and keys[ord('p')] & p.KEY_WAS_TRIGGERED:
+            if (v := keys.get(KEY_P)) and v & p.KEY_WAS_TRIGGERED:
                 path_mode = 'leftward' if path_mode == 'forward' else 'forward'
                 
                 # Instantly set orientation based on mode
-                current_pos = robot.get_position()
-                if path_mode == 'forward':
-                    # Face toward goal (Y direction = 90 degrees)
-                    new_orientation = p.getQuaternionFromEuler([0, 0, math.pi/2])
-                else:  # leftward
-                    # Face 90 degrees from path (perpendicular to path = 0 degrees) 
-                    new_orientation = p.getQuaternionFromEuler([0, 0, 0])
+                current_pos = robot.get_position(tick)
+                # Forward faces the goal (Y direction = 90 degrees); leftward faces
+                # 90 degrees from the path (perpendicular to path = 0 degrees)
+                new_orientation = QUAT_FORWARD if path_mode == 'forward' else QUAT_LEFTWARD
                 
                 p.resetBasePositionAndOrientation(robot.robot_id, current_pos, new_orientation)
                 print(f"Path Mode: {path_mode}")
                 
-            if ord('s') in keys and keys[ord('s')] & p.KEY_WAS_TRIGGERED:
+            if (v := keys.get(KEY_S)) and v & p.KEY_WAS_TRIGGERED:
                 path_controller.current_speed_mode = (path_controller.current_speed_mode + 1) % len(path_controller.speed_modes)
                 current_mode = path_controller.speed_modes[path_controller.current_speed_mode]
                 gaze_status = "with gaze" if path_controller.gaze_enabled else "no gaze"
                 print(f"Speed Mode: {current_mode} ({gaze_status})")
                 
-            if ord('g') in keys and keys[ord('g')] & p.KEY_WAS_TRIGGERED:
+            if (v := keys.get(KEY_G)) and v & p.KEY_WAS_TRIGGERED:
                 path_controller.gaze_enabled = not path_controller.gaze_enabled
                 current_mode = path_controller.speed_modes[path_controller.current_speed_mode]
                 gaze_status = "with gaze" if path_controller.gaze_enabled else "no gaze"
                 print(f"Gaze Mode: {'ON' if path_controller.gaze_enabled else 'OFF'}")
                 print(f"Current: {current_mode} ({gaze_status})")
                 
-            if ord('r') in keys and keys[ord('r')] & p.KEY_WAS_TRIGGERED:
+            if (v := keys.get(KEY_R)) and v & p.KEY_WAS_TRIGGERED:
                 robot.reset()
                 is_walking = False
                 path_mode = 'leftward'  # Reset to starting mode
@@ -295,12 +498,11 @@ def main():
             if is_walking and start_time is not None:
                 # Calculate elapsed time and distance
                 elapsed_time = current_time - start_time
-                current_pos = robot.get_position()
+                current_pos = robot.get_position(tick)
                 
-                # Calculate distance traveled from start
+                # Calculate distance traveled from start (path runs along Y only)
                 if initial_pos is not None:
-                    distance_traveled = math.sqrt((current_pos[0] - initial_pos[0])**2 + 
-                                                (current_pos[1] - initial_pos[1])**2)
+                    distance_traveled = abs(current_pos[1] - initial_pos[1])
                 else:
                     distance_traveled = 0
                 
@@ -317,29 +519,15 @@ def main():
                     print(f"Robot RESUMED at {distance_traveled:.1f}m")
                     path_controller.was_stopped = False
                 
-                # Calculate velocities based on path mode
-                if path_mode == 'forward':
-                    # Move forward along Y-axis
-                    linear_velocity = [0, target_speed, 0]
-                    
-                    # Apply only gaze control (robot already faces correct direction)
-                    gaze_rad = math.radians(gaze_angle)
-                    angular_velocity = [0, 0, gaze_rad * 0.1]  # Subtle gaze movement only
-                    
-                else:  # leftward
-                    # Crab-walk toward goal (positive Y) while facing perpendicular to path
-                    linear_velocity = [0, target_speed, 0]  # Same direction as forward mode
-                    
-                    # Apply only gaze control (robot already faces correct direction)
-                    gaze_rad = math.radians(gaze_angle)
-                    angular_velocity = [0, 0, gaze_rad * 0.1]  # Subtle gaze movement only
-                
-                # Update robot
-                robot.set_base_velocity(linear_velocity, angular_velocity)
+                # Update robot: both path modes move toward the goal along +Y
+                # (leftward crab-walks), only the orientation set on 'P' differs
+                robot.set_base_velocity_scalar(target_speed, gaze_angle * 0.1)
                 
                 # Apply gait only when moving, standing pose when stopped
                 if target_speed > 0:
-                    speed_factor = max(0.1, target_speed / 2.0)  # Scale gait frequency with speed
+                    speed_factor = target_speed * 0.5  # Scale gait frequency with speed
+                    if speed_factor < 0.1:
+                        speed_factor = 0.1
                     robot.apply_trot_gait(elapsed_time, speed_factor)
                 else:
                     # Robot is stopped - use standing pose instead of walking animation
@@ -352,11 +540,12 @@ def main():
                     
             else:
                 # Stop and maintain standing pose
-                robot.set_base_velocity([0, 0, 0], [0, 0, 0])
+                robot.set_base_velocity_scalar(0.0, 0.0)
                 robot.set_standing_pose()
 
             p.stepSimulation()
-            time.sleep(1./240.)
+            if realtime:
+                time.sleep(SIM_DT)
             
     except KeyboardInterrupt:
         print("\nSimulation stopped by user.")
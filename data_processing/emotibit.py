@@ -1,19 +1,16 @@
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # Render straight to PNG files, no GUI windows
 import matplotlib.pyplot as plt
-from collections import Counter
 
 # ---- Step 1: Load and parse the CSV ----
-file_path = ""  
+file_path = ""
 
-# Read raw lines from the CSV (handles inconsistent rows)
-with open(file_path, "r") as file:
-    lines = file.readlines()
-
-# Split each line by comma
-split_lines = [line.strip().split(",") for line in lines]
-
-sensor_types = list({row[3] for row in split_lines if len(row) > 3})
-print("Detected Sensor Types:", sensor_types)
 numerical_sensors = ["EA", "EL", "HR", "T1", "AX", "AY", "AZ", "GX", "GY", "GZ"]
 
 sensor_labels = {
@@ -29,33 +26,110 @@ sensor_labels = {
     "GZ": ("Gyroscope Z-Axis", "Angular Velocity (°/s)"),
 }
 
-sensor_data = {sensor: [] for sensor in numerical_sensors}
-time_data = {sensor: [] for sensor in numerical_sensors}
-
-for row in split_lines:
-    if len(row) >= 7 and row[3] in numerical_sensors:
-        try:
-            timestamp = int(row[0]) / 1000.0  # Convert ms to seconds
-            value = float(row[6])
-            sensor_data[row[3]].append(value)
-            time_data[row[3]].append(timestamp)
-        except ValueError:
-            continue
-
-for sensor in numerical_sensors:
-    if sensor_data[sensor]:
-        title, ylabel = sensor_labels.get(sensor, (sensor, "Value"))
-        plt.figure(figsize=(10, 3))
-        plt.plot(time_data[sensor], sensor_data[sensor], label=sensor)
-        plt.title(f"{title} Over Time")
-        plt.xlabel("Time (s)")
-        plt.ylabel(ylabel)
-        plt.grid(True)
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
-
-sensor_counts = Counter(row[3] for row in split_lines if len(row) > 3)
-print("\nSensor Row Counts:")
-for sensor, count in sensor_counts.items():
-    print(f"{sensor}: {count}")
+CHUNK_SIZE = 200_000  # Rows per read; bounds peak memory for long recordings
+MAX_PLOT_POINTS = 5000  # High-rate traces are decimated to about this many points
+MIN_DECIMATE_RATE = 10.0  # Hz; slow signals (HR, T1, EA) are plotted at full resolution
+PLOT_WINDOW = None  # Optional (start_s, end_s) on the plots' time axis to zoom into
+MAX_ROW_FIELDS = 32  # Placeholder header width; wider than any EmotiBit packet
+
+
+def time_window(t, v, t_lo=None, t_hi=None):
+    """Slice a trace to t_lo <= t < t_hi; t is sorted, so this is O(log n)."""
+    lo = 0 if t_lo is None else np.searchsorted(t, t_lo, side="left")
+    hi = len(t) if t_hi is None else np.searchsorted(t, t_hi, side="left")
+    return t[lo:hi], v[lo:hi]
+
+
+def render_plot(sensor, t, v, out_path):
+    """Render one sensor trace to a PNG (runs in a worker process)."""
+    title, ylabel = sensor_labels.get(sensor, (sensor, "Value"))
+    fig, ax = plt.subplots(figsize=(10, 3))
+    ax.plot(t, v, label=sensor)
+    ax.set_title(f"{title} Over Time")
+    ax.set_xlabel("Time (s)")
+    ax.set_ylabel(ylabel)
+    ax.grid(True)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=100)
+    plt.close(fig)
+    return out_path
+
+
+def main():
+    sensor_counts = Counter()
+    value_chunks = {sensor: [] for sensor in numerical_sensors}
+    time_chunks = {sensor: [] for sensor in numerical_sensors}
+
+    # Rows have inconsistent lengths, and the C parser otherwise takes its column
+    # count from the first line, so give it a fixed header wider than any packet:
+    # shorter rows are padded with NaN, while '#' metadata lines and rows longer
+    # than MAX_ROW_FIELDS are dropped by the parser itself
+    reader = pd.read_csv(
+        file_path,
+        header=None,
+        names=range(MAX_ROW_FIELDS),
+        dtype=str,
+        comment="#",
+        on_bad_lines="skip",
+        engine="c",
+        chunksize=CHUNK_SIZE,
+    )
+    for chunk in reader:
+        # Only the timestamp (ms), sensor type tag and first payload value are needed
+        chunk = chunk[[0, 3, 6]]
+        chunk.columns = ["timestamp_ms", "sensor", "value"]
+        sensor_counts.update(chunk["sensor"].value_counts(sort=False).to_dict())
+
+        # Keep rows of the plotted sensors whose timestamp and value are numeric
+        chunk = chunk[chunk["sensor"].isin(numerical_sensors)]
+        chunk = pd.DataFrame({
+            "sensor": chunk["sensor"],
+            "time": pd.to_numeric(chunk["timestamp_ms"], errors="coerce") / 1000.0,  # Convert ms to seconds
+            "value": pd.to_numeric(chunk["value"], errors="coerce"),
+        }).dropna()
+        for sensor, group in chunk.groupby("sensor"):
+            value_chunks[sensor].append(group["value"].to_numpy())
+            time_chunks[sensor].append(group["time"].to_numpy())
+
+    sensor_types = list(sensor_counts)
+    print("Detected Sensor Types:", sensor_types)
+
+    # Join each sensor's pieces once at the end
+    sensor_data = {sensor: np.concatenate(parts) for sensor, parts in value_chunks.items() if parts}
+    time_data = {sensor: np.concatenate(parts) for sensor, parts in time_chunks.items() if parts}
+
+    # Plots are written next to the CSV and rendered in parallel
+    out_dir = os.path.splitext(file_path)[0] + "_plots"
+    os.makedirs(out_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = []
+        for sensor in numerical_sensors:
+            if sensor in sensor_data:
+                t, v = time_data[sensor], sensor_data[sensor]
+                if PLOT_WINDOW is not None:
+                    t, v = time_window(t, v, *PLOT_WINDOW)
+                    if not len(t):
+                        continue
+
+                # Stride-decimate high-rate traces; extra points collapse to the same pixels
+                if len(v) > MAX_PLOT_POINTS:
+                    duration = t[-1] - t[0]
+                    if duration <= 0 or len(v) / duration > MIN_DECIMATE_RATE:
+                        step = len(v) // MAX_PLOT_POINTS
+                        t, v = t[::step], v[::step]
+
+                out_path = os.path.join(out_dir, f"{sensor}.png")
+                futures.append(pool.submit(render_plot, sensor, t, v, out_path))
+
+        for future in futures:
+            print("Saved plot:", future.result())
+
+    print("\nSensor Row Counts:")
+    for sensor, count in sensor_counts.items():
+        print(f"{sensor}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The scripts are run from their own directories and import each other by name
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for subdir in ("control_system", "data_processing"):
+    sys.path.insert(0, os.path.join(ROOT, subdir))
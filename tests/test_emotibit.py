@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("matplotlib")
+
+import emotibit
+
+# First line is shorter than the data rows; later rows are short, ragged or long
+RAGGED_CSV = """\
+1030,4,0,RB,1,100
+1040,5,1,EA,1,100,0.5
+1050,6,3,HR,1,100,72,73,74
+1060,7,0,UN
+2,3
+1070,8,1,EA,1,100,0.7
+1080,9,12,AX,1,100,0.1,0.2,0.3,0.4,0.5,0.6,0.7,0.8,0.9,1.0,1.1,1.2
+1090,10,1,T1,1,100,33.1
+"""
+
+
+@pytest.fixture
+def ragged_csv(tmp_path, monkeypatch):
+    path = tmp_path / "recording.csv"
+    path.write_text(RAGGED_CSV)
+    monkeypatch.setattr(emotibit, "file_path", str(path))
+    return path
+
+
+def test_ragged_rows_with_short_first_line(ragged_csv, capsys):
+    emotibit.main()
+    out = capsys.readouterr().out
+
+    counts = out.split("Sensor Row Counts:")[1]
+    for line in ("RB: 1", "EA: 2", "HR: 1", "UN: 1", "AX: 1", "T1: 1"):
+        assert line in counts
+
+    plot_dir = os.path.splitext(ragged_csv)[0] + "_plots"
+    assert sorted(os.listdir(plot_dir)) == ["AX.png", "EA.png", "HR.png", "T1.png"]
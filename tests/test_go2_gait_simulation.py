@@ -0,0 +1,97 @@
+import math
+import multiprocessing
+
+import pytest
+
+np = pytest.importorskip("numpy")
+p = pytest.importorskip("pybullet")
+
+import go2_gait_simulation as sim
+
+LEGS = ("FR", "FL", "RR", "RL")
+
+
+def _link(name, mass, size):
+    return f"""
+  <link name="{name}">
+    <inertial><mass value="{mass}"/><inertia ixx="0.01" ixy="0" ixz="0" iyy="0.01" iyz="0" izz="0.01"/></inertial>
+    <collision><geometry><box size="{size}"/></geometry></collision>
+  </link>"""
+
+
+def _joint(name, parent, child, xyz):
+    return f"""
+  <joint name="{name}" type="revolute">
+    <parent link="{parent}"/><child link="{child}"/>
+    <origin xyz="{xyz}"/><axis xyz="0 1 0"/>
+    <limit lower="-3" upper="3" effort="50" velocity="20"/>
+  </joint>"""
+
+
+@pytest.fixture
+def toy_urdf(tmp_path, monkeypatch):
+    """A box body with Go2-named hip/thigh/calf joints, standing in for the Go2 URDF."""
+    parts = ['<robot name="toy_go2">', _link("base", 5.0, "0.4 0.2 0.1")]
+    for leg in LEGS:
+        x = 0.15 if leg[0] == "F" else -0.15
+        y = -0.08 if leg[1] == "R" else 0.08
+        parts.append(_link(f"{leg}_hip", 0.3, "0.05 0.05 0.05"))
+        parts.append(_link(f"{leg}_thigh", 0.3, "0.03 0.03 0.15"))
+        parts.append(_link(f"{leg}_calf", 0.2, "0.02 0.02 0.15"))
+        parts.append(_joint(f"{leg}_hip_joint", "base", f"{leg}_hip", f"{x} {y} 0"))
+        parts.append(_joint(f"{leg}_thigh_joint", f"{leg}_hip", f"{leg}_thigh", "0 0 -0.05"))
+        parts.append(_joint(f"{leg}_calf_joint", f"{leg}_thigh", f"{leg}_calf", "0 0 -0.15"))
+    parts.append("</robot>")
+    path = tmp_path / "toy_go2.urdf"
+    path.write_text("\n".join(parts))
+    monkeypatch.setattr(sim, "URDF_PATH", str(path))
+    return path
+
+
+def test_module_exports():
+    # go2_gait.py imports PathController from this module at startup
+    assert len(sim.Go2Robot.TROT_JOINT_ORDER) == 12
+    assert sim.Go2Robot.TROT_JOINT_ORDER[:4] == [f"{leg}_hip_joint" for leg in sim.Go2Robot.TROT_LEGS]
+    assert callable(sim.PathController)
+
+
+def test_trot_targets_match_per_leg_formulas():
+    out = np.empty(12)
+    phase_sign = np.array(sim.Go2Robot.TROT_PHASE_SIGN)
+    amp, step_h = 0.3, 0.15
+    for t in (0.0, 0.1, 0.37, 1.9):
+        omega = 2 * math.pi * 1.5 * 0.8
+        sim._compute_trot_targets(t, omega, amp, step_h, 0.0, 0.8, -1.4, phase_sign, out)
+        for lane, offset in enumerate((0.0, 0.0, math.pi, math.pi)):
+            phase = math.sin(omega * t + offset)
+            lift = max(0, phase) * step_h
+            assert out[lane] == pytest.approx(phase * 0.1, abs=1e-12)
+            assert out[4 + lane] == pytest.approx(0.8 + phase * amp - lift * 0.5, abs=1e-12)
+            assert out[8 + lane] == pytest.approx(-1.4 - phase * amp * 0.8 + lift * 1.2, abs=1e-12)
+
+
+def test_gaze_angle_matches_sine():
+    controller = sim.PathController()
+    controller.gaze_enabled = True
+    for step in range(1, 600):
+        t = step * sim.SIM_DT
+        expected = math.radians(15) * math.sin(0.5 * t)
+        assert controller.get_gaze_angle(t) == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("path_mode", ["leftward", "forward"])
+@pytest.mark.parametrize("speed_mode", range(6))
+def test_run_episode_smoke(toy_urdf, speed_mode, path_mode):
+    result = sim.run_episode({"speed_mode": speed_mode, "path_mode": path_mode, "gaze_enabled": True})
+    assert result is not None
+    assert result["completed"]
+    assert result["distance"] >= 15.0
+    assert 0 < result["steps"] < int(60 / sim.SIM_DT)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="workers only see the patched URDF_PATH when forked")
+def test_batch_main(toy_urdf):
+    results = sim.batch_main(2, [{"speed_mode": 0, "max_steps": 30}, {"speed_mode": 3, "max_steps": 30}])
+    assert [r["config"]["speed_mode"] for r in results] == [0, 3]
+    assert all(r["steps"] == 30 for r in results)